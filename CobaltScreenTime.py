@@ -8,14 +8,34 @@ from datetime import datetime, timedelta, time as dt_time
 import logging
 import traceback
 import json 
+import re
 
 # --- הגדרות ---
+# All managed tasks live in this Task Scheduler folder so they can be queried/removed in bulk.
+TASK_FOLDER = "\\CobaltScreenTime\\"
+# Single fixed tasks created by older versions (root folder). Removed on the next apply/cancel.
 TASK_NAME = "DailyAutoRestartByMyScript"
 NOTIFICATION_TASK_NAME = "DailyAutoRestartNotificationByMyScript"
+LEGACY_TASK_NAMES = [TASK_NAME, NOTIFICATION_TASK_NAME]
 LOG_FILE_NAME = "restart_scheduler.log"
 CONFIG_FILE_NAME = "restart_scheduler_config.json"
 
-DEFAULT_NOTIFICATION_MESSAGE = "מחשב זה יופעל מחדש בעוד דקה.\nשמור כל קובץ פתוח למנוע אובדן מידע."
+# {minutes} is replaced by format_minutes(), e.g. "דקה" / "5 דקות".
+DEFAULT_NOTIFICATION_MESSAGE = "מחשב זה יופעל מחדש בעוד {minutes}.\nשמור כל קובץ פתוח למנוע אובדן מידע."
+DEFAULT_LOGOFF_MESSAGE = "כל המשתמשים ינותקו מהמחשב בעוד {minutes}.\nשמור כל קובץ פתוח למנוע אובדן מידע."
+DEFAULT_WARNING_MINUTES = "15,5,1"
+MAX_WARNING_MINUTES = 24 * 60 # Lead times must stay within one day
+
+WEEKDAY_CODES = ["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"]
+WEEKDAY_LABELS = ["א'", "ב'", "ג'", "ד'", "ה'", "ו'", "ש'"]
+INVALID_TASK_NAME_CHARS = '\\/:*?"<>|'
+
+# Logs off every interactive session (runs as SYSTEM, so 'shutdown /l' would only log off SYSTEM itself).
+LOGOFF_COMMAND = "powershell -NoProfile -WindowStyle Hidden -Command \"quser 2>$null | Select-Object -Skip 1 | ForEach-Object { if ($_ -match '^.\\S+\\s+(?:\\S+\\s+)?(\\d+)\\s') { logoff $Matches[1] } }\""
+SCHEDULE_ACTIONS = {
+    "restart": {"label": "הפעלה מחדש", "command": "shutdown /r /f /t 0", "default_message": DEFAULT_NOTIFICATION_MESSAGE},
+    "logoff": {"label": "התנתקות משתמשים", "command": LOGOFF_COMMAND, "default_message": DEFAULT_LOGOFF_MESSAGE},
+}
 
 # --- הגדרת יומן רישום (Logging) ---
 def setup_logging():
@@ -79,7 +99,7 @@ def load_config():
     config_path = get_config_path()
     default_config = {
         "notification_message": DEFAULT_NOTIFICATION_MESSAGE,
-        "user_lockout_schedules": {} 
+        "user_lockout_schedules": {} # "restart_schedules" is left unset until the legacy task is migrated
     }
     try:
         if os.path.exists(config_path):
@@ -106,15 +126,109 @@ def save_config(config_data):
         log_exception(f"Error saving config file '{config_path}': {e}")
         messagebox.showerror("שגיאת שמירה", f"לא ניתן היה לשמור את ההגדרות:\n{e}")
 
+# --- לוחות זמנים להפעלה מחדש / התנתקות ---
+def parse_warning_minutes(text):
+    # "15, 5, 1" -> [15, 5, 1]. Raises ValueError on bad input.
+    minutes = set()
+    for part in text.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        value = int(part)
+        if not 1 <= value < MAX_WARNING_MINUTES:
+            raise ValueError(f"Warning lead time out of range: {value}")
+        minutes.add(value)
+    return sorted(minutes, reverse=True)
+
+def format_minutes(minutes):
+    if minutes == 1:
+        return "דקה"
+    if minutes == 2:
+        return "שתי דקות"
+    return f"{minutes} דקות"
+
+def format_days(days):
+    if set(days) == set(WEEKDAY_CODES):
+        return "כל יום"
+    return " ".join(label for code, label in zip(WEEKDAY_CODES, WEEKDAY_LABELS) if code in days)
+
+def shift_days(days, offset):
+    return [WEEKDAY_CODES[(WEEKDAY_CODES.index(day) + offset) % 7] for day in days]
+
+def schedule_trigger_args(days, time_str):
+    if set(days) == set(WEEKDAY_CODES):
+        return ["/sc", "DAILY", "/st", time_str]
+    ordered_days = [code for code in WEEKDAY_CODES if code in days]
+    return ["/sc", "WEEKLY", "/d", ",".join(ordered_days), "/st", time_str]
+
+def build_schedule_tasks(schedule):
+    # Returns {full task name: schtasks /create command} for the action task and each of its warnings.
+    base_name = f"{TASK_FOLDER}{schedule['name']}"
+    action = schedule["action"]
+    action_dt = datetime.strptime(f"{schedule['hh']}:{schedule['mm']}", "%H:%M")
+    tasks = {}
+
+    action_task_name = f"{base_name} - {action}"
+    tasks[action_task_name] = [
+        "schtasks", "/create", "/tn", action_task_name,
+        "/tr", SCHEDULE_ACTIONS[action]["command"]
+    ] + schedule_trigger_args(schedule["days"], action_dt.strftime("%H:%M")) + ["/ru", "SYSTEM", "/f"]
+
+    for minutes in schedule["warnings"]:
+        warning_dt = action_dt - timedelta(minutes=minutes)
+        # A warning before midnight belongs to the previous weekday.
+        day_offset = (warning_dt.date() - action_dt.date()).days
+        message = schedule["message"].replace("{minutes}", format_minutes(minutes)).replace('"', '""')
+        warning_task_name = f"{base_name} - warn {minutes}m"
+        tasks[warning_task_name] = [
+            "schtasks", "/create", "/tn", warning_task_name,
+            "/tr", f'msg.exe * "{message}"'
+        ] + schedule_trigger_args(shift_days(schedule["days"], day_offset), warning_dt.strftime("%H:%M")) + ["/rl", "HIGHEST", "/it", "/f"]
+    return tasks
+
+def parse_task_time(query_output):
+    # Reads HH:MM from the "Next Run Time" line of 'schtasks /query /fo LIST' (24h or AM/PM). None if not found.
+    for line in query_output.splitlines():
+        if line.startswith("Next Run Time:") or line.startswith("זמן ריצה הבא:"):
+            match = re.search(r"(\d{1,2}):(\d{2})(?::\d{2})?\s*(AM|PM)?", line.split(":", 1)[1], re.IGNORECASE)
+            if not match:
+                return None
+            hour = int(match.group(1)) % 12 if match.group(3) else int(match.group(1))
+            if match.group(3) and match.group(3).upper() == "PM":
+                hour += 12
+            return f"{hour:02d}", match.group(2)
+    return None
+
+def diff_task_names(existing_names, desired_names):
+    # Task Scheduler names are case-insensitive. Returns (missing desired names, stale existing names).
+    existing_keys = {name.casefold() for name in existing_names}
+    desired_keys = {name.casefold() for name in desired_names}
+    missing = {name for name in desired_names if name.casefold() not in existing_keys}
+    stale = {name for name in existing_names if name.casefold() not in desired_keys}
+    return missing, stale
+
+def ps_quote(value):
+    return "'" + value.replace("'", "''") + "'"
+
+def managed_tasks_ps_expression():
+    # PowerShell expression selecting every task owned by this app: the whole folder plus legacy root tasks.
+    # Filters one unscoped Get-ScheduledTask, so a missing folder or missing legacy tasks are not errors
+    # (a scoped -TaskPath/-TaskName lookup would fail and make powershell exit non-zero).
+    legacy_names = ",".join(ps_quote(name) for name in LEGACY_TASK_NAMES)
+    return (f"@(Get-ScheduledTask | Where-Object {{ $_.TaskPath -eq {ps_quote(TASK_FOLDER)} -or "
+            f"($_.TaskPath -eq '\\' -and $_.TaskName -in @({legacy_names})) }})")
+
 # --- מחלקת ה-GUI ---
 class RestartSchedulerApp:
     def __init__(self, master):
         self.master = master
         log_info("Initializing GUI.")
         master.title("CobaltScreenTime")
-        master.geometry("600x600") # Reduced height a bit due to less controls
+        master.geometry("650x760")
 
         self.config = load_config()
+        if "restart_schedules" not in self.config:
+            self.migrate_legacy_restart_task()
 
         try:
             master.tk.call('tk', 'scaling', 1.1)
@@ -156,15 +270,42 @@ class RestartSchedulerApp:
         log_info("GUI Initialized successfully.")
 
     def create_restart_tab_content(self):
-        # This function content remains the same as previous correct version
-        time_frame_outer = ttk.LabelFrame(self.restart_tab, text="הגדרת שעת הפעלה מחדש", padding=(10, 5))
-        time_frame_outer.pack(pady=10, padx=0, fill="x")
-
-        self.label_time = ttk.Label(time_frame_outer, text="בחר שעת הפעלה מחדש יומית:", font=self.custom_font)
-        self.label_time.pack(pady=(0,5), anchor="e")
-
-        time_frame_inner = ttk.Frame(time_frame_outer)
-        time_frame_inner.pack() 
+        list_frame = ttk.LabelFrame(self.restart_tab, text="לוחות זמנים להפעלה מחדש / התנתקות", padding=(10, 5))
+        list_frame.pack(pady=5, padx=0, fill="x")
+
+        columns = ("warnings", "days", "time", "action", "name")
+        self.schedule_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=5, selectmode="browse")
+        for column, heading, width in [("name", "שם", 110), ("action", "פעולה", 110), ("time", "שעה", 50), ("days", "ימים", 130), ("warnings", "התראות (דקות)", 100)]:
+            self.schedule_tree.heading(column, text=heading, anchor="e")
+            self.schedule_tree.column(column, width=width, anchor="e")
+        self.schedule_tree.pack(fill="x")
+        self.schedule_tree.bind("<<TreeviewSelect>>", self.load_selected_schedule_event)
+
+        list_button_frame = ttk.Frame(list_frame)
+        list_button_frame.pack(pady=(5,0))
+        ttk.Button(list_button_frame, text="הוסף / עדכן לוח זמנים", command=self.save_schedule_from_editor).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(list_button_frame, text="מחק לוח זמנים נבחר", command=self.remove_selected_schedule).pack(side=tk.RIGHT, padx=5)
+
+        editor_frame = ttk.LabelFrame(self.restart_tab, text="עריכת לוח זמנים", padding=(10, 5))
+        editor_frame.pack(pady=5, padx=0, fill="x")
+
+        name_frame = ttk.Frame(editor_frame)
+        name_frame.pack(fill="x", pady=2)
+        ttk.Label(name_frame, text="שם:", font=self.custom_font).pack(side=tk.RIGHT, padx=(0,5))
+        self.schedule_name_var = tk.StringVar(self.master, value="יומי")
+        ttk.Entry(name_frame, textvariable=self.schedule_name_var, width=20, font=self.custom_font, justify=tk.RIGHT).pack(side=tk.RIGHT)
+
+        ttk.Label(name_frame, text="פעולה:", font=self.custom_font).pack(side=tk.RIGHT, padx=(15,5))
+        self.action_labels = {action: info["label"] for action, info in SCHEDULE_ACTIONS.items()}
+        self.schedule_action_var = tk.StringVar(self.master, value=self.action_labels["restart"])
+        self.schedule_action_combo = ttk.Combobox(name_frame, textvariable=self.schedule_action_var, values=list(self.action_labels.values()), width=15, state="readonly", font=self.custom_font)
+        self.schedule_action_combo.pack(side=tk.RIGHT)
+        self.schedule_action_combo.bind("<<ComboboxSelected>>", self.schedule_action_changed_event)
+
+        time_frame_inner = ttk.Frame(editor_frame)
+        time_frame_inner.pack(fill="x", pady=2)
+        self.label_time = ttk.Label(time_frame_inner, text="שעה:", font=self.custom_font)
+        self.label_time.pack(side=tk.RIGHT, padx=(0,5))
 
         self.hour_var = tk.StringVar(self.master) 
         self.minute_var = tk.StringVar(self.master) 
@@ -183,25 +324,142 @@ class RestartSchedulerApp:
         self.hour_spinbox = ttk.Combobox(time_frame_inner, textvariable=self.hour_var, values=hours, width=3, state="readonly", font=self.custom_font)
         self.hour_spinbox.pack(side=tk.RIGHT, padx=(5,0)) 
 
-        message_frame = ttk.LabelFrame(self.restart_tab, text="הגדרת הודעת התראה להפעלה מחדש", padding=(10, 5))
-        message_frame.pack(pady=10, padx=0, fill="x")
+        ttk.Label(time_frame_inner, text="התראות (דקות לפני, מופרדות בפסיק):", font=self.custom_font).pack(side=tk.RIGHT, padx=(15,5))
+        self.warning_minutes_var = tk.StringVar(self.master, value=DEFAULT_WARNING_MINUTES)
+        ttk.Entry(time_frame_inner, textvariable=self.warning_minutes_var, width=10, font=self.custom_font).pack(side=tk.RIGHT)
 
-        self.label_message_restart = ttk.Label(message_frame, text="טקסט ההודעה (תוצג דקה לפני ההפעלה מחדש):", font=self.custom_font)
-        self.label_message_restart.pack(pady=(0,5), anchor="e")
+        days_frame = ttk.Frame(editor_frame)
+        days_frame.pack(fill="x", pady=2)
+        ttk.Label(days_frame, text="ימים:", font=self.custom_font).pack(side=tk.RIGHT, padx=(0,5))
+        self.day_vars = {}
+        for code, label in zip(WEEKDAY_CODES, WEEKDAY_LABELS):
+            self.day_vars[code] = tk.BooleanVar(self.master, value=True)
+            ttk.Checkbutton(days_frame, text=label, variable=self.day_vars[code]).pack(side=tk.RIGHT, padx=2)
 
-        self.notification_message_text = scrolledtext.ScrolledText(message_frame, width=50, height=3, font=self.custom_font, wrap=tk.WORD)
+        self.label_message_restart = ttk.Label(editor_frame, text="טקסט ההודעה ({minutes} יוחלף בזמן שנותר, למשל 'דקה' או '5 דקות'):", font=self.custom_font)
+        self.label_message_restart.pack(pady=(5,5), anchor="e")
+
+        self.notification_message_text = scrolledtext.ScrolledText(editor_frame, width=50, height=3, font=self.custom_font, wrap=tk.WORD)
         self.notification_message_text.pack(fill="x", expand=True)
-        self.notification_message_text.insert(tk.END, self.config.get("notification_message", DEFAULT_NOTIFICATION_MESSAGE))
+        self.notification_message_text.insert(tk.END, SCHEDULE_ACTIONS["restart"]["default_message"])
 
         button_frame_restart = ttk.Frame(self.restart_tab)
-        button_frame_restart.pack(pady=20)
+        button_frame_restart.pack(pady=10)
 
-        self.set_button_restart = ttk.Button(button_frame_restart, text="קבע הפעלה מחדש", command=self.set_restart_time, style="Accent.TButton")
+        self.set_button_restart = ttk.Button(button_frame_restart, text="החל לוחות זמנים", command=self.apply_restart_schedules, style="Accent.TButton")
         self.set_button_restart.pack(side=tk.RIGHT, padx=5)
 
-        self.cancel_button_restart = ttk.Button(button_frame_restart, text="בטל הפעלה מחדש מתוזמנת", command=self.cancel_restart_task)
+        self.cancel_button_restart = ttk.Button(button_frame_restart, text="בטל את כל המשימות המתוזמנות", command=self.cancel_restart_task)
         self.cancel_button_restart.pack(side=tk.RIGHT, padx=5)
 
+        self.refresh_schedule_tree()
+
+    def refresh_schedule_tree(self):
+        self.schedule_tree.delete(*self.schedule_tree.get_children())
+        for schedule in self.config.get("restart_schedules", []):
+            self.schedule_tree.insert("", tk.END, iid=schedule["name"], values=(
+                ", ".join(str(m) for m in schedule["warnings"]),
+                format_days(schedule["days"]),
+                f"{schedule['hh']}:{schedule['mm']}",
+                SCHEDULE_ACTIONS[schedule["action"]]["label"],
+                f"{schedule['name']} *" if schedule.get("pending_apply", True) else schedule["name"],
+            ))
+
+    def load_selected_schedule_event(self, event=None):
+        selection = self.schedule_tree.selection()
+        if not selection:
+            return
+        schedule = next((s for s in self.config.get("restart_schedules", []) if s["name"] == selection[0]), None)
+        if not schedule:
+            return
+        self.schedule_name_var.set(schedule["name"])
+        self.schedule_action_var.set(SCHEDULE_ACTIONS[schedule["action"]]["label"])
+        self.hour_var.set(schedule["hh"])
+        self.minute_var.set(schedule["mm"])
+        self.warning_minutes_var.set(",".join(str(m) for m in schedule["warnings"]))
+        for code, var in self.day_vars.items():
+            var.set(code in schedule["days"])
+        self.notification_message_text.delete("1.0", tk.END)
+        self.notification_message_text.insert(tk.END, schedule["message"])
+
+    def schedule_action_changed_event(self, event=None):
+        # Swap in the new action's default message unless the user has written their own.
+        action = next(a for a, label in self.action_labels.items() if label == self.schedule_action_var.get())
+        current_message = self.notification_message_text.get("1.0", tk.END).strip()
+        default_messages = [info["default_message"].strip() for info in SCHEDULE_ACTIONS.values()]
+        if not current_message or current_message in default_messages:
+            self.notification_message_text.delete("1.0", tk.END)
+            self.notification_message_text.insert(tk.END, SCHEDULE_ACTIONS[action]["default_message"])
+
+    def save_schedule_from_editor(self):
+        name = self.schedule_name_var.get().strip()
+        if not name or any(c in INVALID_TASK_NAME_CHARS for c in name):
+            messagebox.showerror("שגיאה", f"שם לוח הזמנים ריק או מכיל תווים אסורים ({INVALID_TASK_NAME_CHARS}).")
+            return
+        # Task names are case-insensitive, so "Daily" and "daily" are the same schedule: saving updates (renames) it.
+        renamed_schedule = next((s for s in self.config.get("restart_schedules", []) if s["name"] != name and s["name"].casefold() == name.casefold()), None)
+        if renamed_schedule:
+            log_info(f"Renaming restart schedule '{renamed_schedule['name']}' to '{name}'.")
+
+        action = next(a for a, label in self.action_labels.items() if label == self.schedule_action_var.get())
+        hour = self.hour_var.get()
+        minute = self.minute_var.get()
+        try:
+            datetime.strptime(f"{hour}:{minute}", "%H:%M")
+        except ValueError:
+            log_error(f"Invalid time format selected: {hour}:{minute}")
+            messagebox.showerror("שגיאה", "שעה לא חוקית.")
+            return
+
+        try:
+            warnings = parse_warning_minutes(self.warning_minutes_var.get())
+        except ValueError:
+            log_error(f"Invalid warning lead times: {self.warning_minutes_var.get()}")
+            messagebox.showerror("שגיאה", f"זמני ההתראה חייבים להיות מספרי דקות שלמים בין 1 ל-{MAX_WARNING_MINUTES - 1}, מופרדים בפסיק.")
+            return
+
+        days = [code for code in WEEKDAY_CODES if self.day_vars[code].get()]
+        if not days:
+            messagebox.showerror("שגיאה", "יש לבחור לפחות יום אחד.")
+            return
+
+        message = self.notification_message_text.get("1.0", tk.END).strip()
+        if warnings and not message:
+            messagebox.showerror("שגיאה", "טקסט הודעת ההתראה לא יכול להיות ריק.")
+            return
+
+        schedule = {
+            "name": name,
+            "action": action,
+            "hh": hour,
+            "mm": minute,
+            "days": days,
+            "warnings": warnings,
+            "message": message,
+            "pending_apply": True, # Edited since the last successful apply
+        }
+        schedules = [s for s in self.config.get("restart_schedules", []) if s["name"].casefold() != name.casefold()]
+        schedules.append(schedule)
+        self.config["restart_schedules"] = schedules
+        save_config(self.config)
+        log_info(f"Saved restart schedule: {schedule}")
+
+        self.refresh_schedule_tree()
+        self.status_label.config(text=f"לוח הזמנים '{name}' נשמר. לחץ 'החל לוחות זמנים' כדי לעדכן את המשימות.", foreground="blue")
+
+    def remove_selected_schedule(self):
+        selection = self.schedule_tree.selection()
+        if not selection:
+            messagebox.showerror("שגיאה", "יש לבחור לוח זמנים תחילה.")
+            return
+        name = selection[0]
+        self.config["restart_schedules"] = [s for s in self.config.get("restart_schedules", []) if s["name"] != name]
+        save_config(self.config)
+        log_info(f"Removed restart schedule: {name}")
+
+        self.refresh_schedule_tree()
+        self.status_label.config(text=f"לוח הזמנים '{name}' הוסר. לחץ 'החל לוחות זמנים' כדי לעדכן את המשימות.", foreground="blue")
+
 
     def create_lockout_tab_content(self):
         lockout_main_frame = ttk.Frame(self.lockout_tab)
@@ -439,15 +697,14 @@ class RestartSchedulerApp:
         log_info(f"Updated config for user {username} lockout: enabled={enabled}, start={start_hh}:00, end={end_hh}:00")
 
 
-    def _run_command(self, command_parts, capture_output=True):
-        # This function content remains the same
+    def _run_command(self, command_parts, capture_output=True, encoding='cp862'):
         command_str = " ".join(f'"{part}"' if " " in part else part for part in command_parts)
         log_info(f"Running command: {command_str}")
         try:
             startupinfo = self.get_startupinfo()
 
             if capture_output:
-                process = subprocess.Popen(command_parts, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='cp862', errors='replace', startupinfo=startupinfo, shell=False)
+                process = subprocess.Popen(command_parts, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding=encoding, errors='replace', startupinfo=startupinfo, shell=False)
                 stdout, stderr = process.communicate(timeout=15)
             else:
                 process = subprocess.Popen(command_parts, startupinfo=startupinfo, shell=False)
@@ -475,163 +732,173 @@ class RestartSchedulerApp:
             return False, str(e)
 
 
-    def set_restart_time(self):
-        # This function content remains the same
-        hour = self.hour_var.get()
-        minute = self.minute_var.get()
-        restart_time_str = f"{hour}:{minute}"
-        
-        custom_message = self.notification_message_text.get("1.0", tk.END).strip()
-        if not custom_message:
-            messagebox.showerror("שגיאה", "טקסט הודעת ההתראה להפעלה מחדש לא יכול להיות ריק.")
-            return
-        
-        self.config["notification_message"] = custom_message
-        save_config(self.config)
+    def _run_powershell(self, script):
+        # Task names may be Hebrew; force UTF-8 output (no BOM) instead of the console codepage, which is not always 862.
+        script = f"[Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false; {script}"
+        return self._run_command(["powershell", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-Command", script], encoding='utf-8-sig')
 
-        log_info(f"Attempting to set restart time to {restart_time_str} with message: '{custom_message[:50]}...'")
+    def query_managed_tasks(self):
+        # One call for all tasks in TASK_FOLDER (plus legacy ones). Returns a set of full task names, or None on error.
+        log_info(f"Querying managed tasks in '{TASK_FOLDER}'.")
+        script = f"{managed_tasks_ps_expression()} | ForEach-Object {{ $_.TaskPath + $_.TaskName }}"
+        success, output = self._run_powershell(script)
+        if not success:
+            log_error(f"Failed to query managed tasks: {output}")
+            return None
+        return {line.strip() for line in output.splitlines() if line.strip()}
 
-        try:
-            datetime.strptime(restart_time_str, "%H:%M")
-        except ValueError:
-            log_error(f"Invalid time format selected: {restart_time_str}")
-            messagebox.showerror("שגיאה", "שעה לא חוקית.")
+    def remove_managed_tasks(self, task_names=None):
+        # One call removing the given full task names, or every task in TASK_FOLDER (plus legacy ones) when None.
+        if task_names is None:
+            log_info(f"Removing all managed tasks in '{TASK_FOLDER}'.")
+            selection = managed_tasks_ps_expression()
+        else:
+            log_info(f"Removing managed tasks: {sorted(task_names)}")
+            names = ",".join(ps_quote(name) for name in task_names)
+            # -contains is case-insensitive, like Task Scheduler names.
+            selection = f"@(Get-ScheduledTask | Where-Object {{ @({names}) -contains ($_.TaskPath + $_.TaskName) }})"
+        script = f"$tasks = {selection}; if ($tasks) {{ $tasks | Unregister-ScheduledTask -Confirm:$false }}"
+        return self._run_powershell(script)
+
+    def migrate_legacy_restart_task(self):
+        # Older versions kept the daily restart time only in the legacy TASK_NAME task; turn it into a schedule
+        # before anything is diffed, otherwise the first apply would remove it and create nothing.
+        log_info(f"No restart schedules in config, checking for legacy task '{TASK_NAME}'.")
+        success, output = self._run_command(["schtasks", "/query", "/tn", TASK_NAME, "/fo", "LIST"])
+        if not success or TASK_NAME not in output:
+            log_info("Legacy restart task not found, nothing to migrate.")
+            self.config["restart_schedules"] = []
+            save_config(self.config)
             return
 
-        self.status_label.config(text="יוצר משימות הפעלה מחדש...", foreground="orange")
-        self.master.update_idletasks()
+        task_time = parse_task_time(output)
+        if not task_time:
+            # Leave restart_schedules unset so migration is retried; apply asks before removing the legacy task.
+            log_warning("Legacy restart task found, but couldn't parse 'Next Run Time'. Not migrating.")
+            return
 
-        self.delete_task(TASK_NAME) 
-        self.delete_task(NOTIFICATION_TASK_NAME)
+        hh, mm = task_time
+        schedule = {
+            "name": "יומי",
+            "action": "restart",
+            "hh": hh,
+            "mm": mm,
+            "days": list(WEEKDAY_CODES),
+            "warnings": [1],
+            "message": self.config.get("notification_message", DEFAULT_NOTIFICATION_MESSAGE),
+            "pending_apply": True,
+        }
+        self.config["restart_schedules"] = [schedule]
+        save_config(self.config)
+        log_info(f"Migrated legacy restart task to schedule: {schedule}")
 
-        log_info(f"Creating main restart task '{TASK_NAME}' for {restart_time_str}.")
-        command_restart = [
-            "schtasks", "/create", "/tn", TASK_NAME,
-            "/tr", "shutdown /r /f /t 0", "/sc", "DAILY", "/st", restart_time_str,
-            "/ru", "SYSTEM", "/f"
-        ]
-        success_restart, message_restart = self._run_command(command_restart)
+    def build_desired_tasks(self):
+        desired_tasks = {}
+        for schedule in self.config.get("restart_schedules", []):
+            desired_tasks.update(build_schedule_tasks(schedule))
+        return desired_tasks
 
-        if not success_restart:
-            log_error(f"Failed to create restart task: {message_restart}")
-            self.status_label.config(text=f"שגיאה ביצירת משימת הפעלה מחדש:\n{message_restart}", foreground="red")
-            messagebox.showerror("שגיאה", f"שגיאה ביצירת משימת הפעלה מחדש:\n{message_restart}")
-            return
+    def apply_restart_schedules(self):
+        schedules = self.config.get("restart_schedules", [])
+        desired_tasks = self.build_desired_tasks()
+        log_info(f"Applying {len(schedules)} restart schedules ({len(desired_tasks)} tasks).")
 
-        restart_dt = datetime.strptime(restart_time_str, "%H:%M")
-        notification_dt = restart_dt - timedelta(minutes=1)
-        notification_time_str = notification_dt.strftime("%H:%M")
-        
-        escaped_custom_message = custom_message.replace('"', '""')
-        notification_command_str = f'msg.exe * "{escaped_custom_message}"'
-        
-        log_info(f"Creating notification task '{NOTIFICATION_TASK_NAME}' for {notification_time_str} using command: {notification_command_str}")
+        self.status_label.config(text="מעדכן משימות מתוזמנות...", foreground="orange")
+        self.master.update_idletasks()
 
-        command_notification = [
-            "schtasks", "/create", "/tn", NOTIFICATION_TASK_NAME,
-            "/tr", notification_command_str, 
-            "/sc", "DAILY", "/st", notification_time_str,
-            "/rl", "HIGHEST", "/it", "/f"
-        ]
-        success_notification, message_notification = self._run_command(command_notification)
+        existing_tasks = self.query_managed_tasks()
+        if existing_tasks is None:
+            log_warning("Could not query existing tasks, removing all managed tasks and recreating every schedule.")
+            tasks_to_remove, missing_tasks = None, set(desired_tasks)
+        else:
+            missing_tasks, tasks_to_remove = diff_task_names(existing_tasks, desired_tasks)
+            log_info(f"Stale tasks to remove: {sorted(tasks_to_remove)}. Missing tasks: {sorted(missing_tasks)}")
 
-        if not success_notification:
-            log_error(f"Failed to create notification task: {message_notification}. Deleting main task for consistency.")
-            self.status_label.config(text=f"שגיאה ביצירת משימת התראה להפעלה מחדש:\n{message_notification}", foreground="red")
-            messagebox.showerror("שגיאה", f"שגיאה ביצירת משימת התראה:\n{message_notification}\n\nמשימת ההפעלה מחדש נוצרה, אך ההתראה לא. מוחק את משימת ההפעלה מחדש.")
-            self.delete_task(TASK_NAME)
-            return
+        if not schedules and (tasks_to_remove is None or tasks_to_remove):
+            if not messagebox.askyesno("אישור", "לא מוגדרים לוחות זמנים.\nהחלה תמחק את כל משימות ההפעלה מחדש הקיימות (כולל משימה מגרסה קודמת) ולא תיצור חדשות.\n\nלהמשיך?"):
+                log_info("Apply with no schedules cancelled by user.")
+                self.check_existing_restart_task()
+                return
 
-        log_info("Restart tasks created successfully.")
-        self.status_label.config(text=f"הפעלה מחדש נקבעה ל-{restart_time_str} מדי יום.\nהתראה עם ההודעה המותאמת תוצג דקה לפני.", foreground="green")
-        messagebox.showinfo("הצלחה", f"הפעלה מחדש נקבעה ל-{restart_time_str} מדי יום.\nהתראה עם ההודעה המותאמת תוצג ב-{notification_time_str}.")
+        if tasks_to_remove is None or tasks_to_remove:
+            success_remove, message_remove = self.remove_managed_tasks(tasks_to_remove)
+            if not success_remove:
+                self.status_label.config(text=f"שגיאה במחיקת משימות קיימות:\n{message_remove}", foreground="red")
+                messagebox.showerror("שגיאה", f"שגיאה במחיקת משימות קיימות:\n{message_remove}")
+                return
+
+        # Existing tasks of unedited schedules are left alone; schtasks has no batch create, /f overwrites the rest.
+        created_count = 0
+        for schedule in schedules:
+            schedule_tasks = build_schedule_tasks(schedule)
+            for task_name, command in schedule_tasks.items():
+                if not schedule.get("pending_apply", True) and task_name not in missing_tasks:
+                    continue
+                log_info(f"Creating task '{task_name}'.")
+                success_create, message_create = self._run_command(command)
+                if not success_create:
+                    log_error(f"Failed to create task '{task_name}': {message_create}. Removing the tasks of schedule '{schedule['name']}' for consistency.")
+                    self.remove_managed_tasks(set(schedule_tasks))
+                    self.status_label.config(text=f"שגיאה ביצירת המשימה '{task_name}':\n{message_create}", foreground="red")
+                    messagebox.showerror("שגיאה", f"שגיאה ביצירת המשימה '{task_name}':\n{message_create}\n\nהמשימות של לוח הזמנים '{schedule['name']}' נמחקו.")
+                    return
+                created_count += 1
+        log_info(f"Created or updated {created_count} tasks.")
+
+        for schedule in self.config.get("restart_schedules", []):
+            schedule["pending_apply"] = False
+        save_config(self.config)
+        self.refresh_schedule_tree()
+
+        log_info("Restart schedules applied successfully.")
+        removed_text = "כל המשימות הקודמות נמחקו" if tasks_to_remove is None else f"{len(tasks_to_remove)} נמחקו"
+        messagebox.showinfo("הצלחה", f"הוחלו {len(schedules)} לוחות זמנים ({len(desired_tasks)} משימות; {created_count} נוצרו או עודכנו, {removed_text}).")
+        self.check_existing_restart_task()
 
     def cancel_restart_task(self):
-        # This function content remains the same
-        log_info("Attempting to cancel scheduled restart tasks.")
+        log_info("Attempting to cancel all scheduled restart tasks.")
         self.status_label.config(text="מבטל משימות הפעלה מחדש...", foreground="orange")
         self.master.update_idletasks()
 
-        success_main, msg_main = self.delete_task(TASK_NAME)
-        success_notif, msg_notif = self.delete_task(NOTIFICATION_TASK_NAME)
-
-        errors = []
-        if not success_main and "not found" not in msg_main.lower() and "לא נמצאה" not in msg_main.lower():
-            errors.append(f"שגיאה בביטול משימת הפעלה מחדש:\n{msg_main}")
-        if not success_notif and "not found" not in msg_notif.lower() and "לא נמצאה" not in msg_notif.lower():
-            errors.append(f"שגיאה בביטול משימת התראה:\n{msg_notif}")
-            
-        if errors:
-            full_error_msg = "\n\n".join(errors)
-            log_error(f"Errors occurred during restart task cancellation: {full_error_msg}")
-            self.status_label.config(text=full_error_msg, foreground="red")
-            messagebox.showerror("שגיאה", full_error_msg)
+        success, message = self.remove_managed_tasks()
+        if not success:
+            log_error(f"Errors occurred during restart task cancellation: {message}")
+            self.status_label.config(text=f"שגיאה בביטול המשימות:\n{message}", foreground="red")
+            messagebox.showerror("שגיאה", f"שגיאה בביטול המשימות:\n{message}")
         else:
             log_info("Restart tasks cancelled successfully (or were not found).")
-            self.status_label.config(text="משימות ההפעלה מחדש וההתראה בוטלו.", foreground="blue")
-            messagebox.showinfo("בוטל", "משימות ההפעלה מחדש וההתראה בוטלו.")
+            messagebox.showinfo("בוטל", "כל משימות ההפעלה מחדש, ההתנתקות וההתראות בוטלו.\nלוחות הזמנים נשמרו וניתן להחיל אותם מחדש.")
         
         self.check_existing_restart_task()
 
     def check_existing_restart_task(self):
-        # This function content remains the same
-        log_info("Checking for existing restart task.")
-        command_query_main = ["schtasks", "/query", "/tn", TASK_NAME, "/fo", "LIST"]
-        success_main, output_main = self._run_command(command_query_main)
+        log_info("Checking existing restart tasks against configured schedules.")
+        existing_tasks = self.query_managed_tasks()
 
         current_status_text = self.status_label.cget("text")
         status_is_lockout_related = "נעילה" in current_status_text or "הוחלו" in current_status_text or "בוטלה" in current_status_text
 
+        if existing_tasks is None:
+            new_status, color = "שגיאה בקריאת המשימות המתוזמנות.", "orange"
+        else:
+            desired_tasks = set(self.build_desired_tasks())
+            missing_tasks, stale_tasks = diff_task_names(existing_tasks, desired_tasks)
+            # Only names are compared; edits to time/days/message are tracked via the pending_apply flag.
+            pending_schedules = [sch["name"] for sch in self.config.get("restart_schedules", []) if sch.get("pending_apply", True)]
+            log_info(f"Managed tasks: {len(existing_tasks)} existing, {len(missing_tasks)} missing, {len(stale_tasks)} stale. Schedules edited since last apply: {pending_schedules}")
+            if not desired_tasks and not existing_tasks:
+                new_status, color = "לא מוגדרות משימות הפעלה מחדש.", "blue"
+            elif missing_tasks or stale_tasks:
+                new_status, color = f"המשימות אינן תואמות ללוחות הזמנים ({len(missing_tasks)} חסרות, {len(stale_tasks)} מיותרות). לחץ 'החל לוחות זמנים'.", "orange"
+            elif pending_schedules:
+                new_status, color = f"לוחות זמנים שנערכו ולא הוחלו: {', '.join(pending_schedules)}. לחץ 'החל לוחות זמנים'.", "orange"
+            else:
+                new_status, color = f"כל {len(desired_tasks)} המשימות המתוזמנות קיימות (אין שינויים שלא הוחלו).", "green"
 
-        if success_main and TASK_NAME in output_main:
-            log_info(f"Restart task '{TASK_NAME}' found.")
-            try:
-                lines = output_main.splitlines()
-                task_time_str = None
-                for line in lines:
-                    if line.startswith("Next Run Time:") or line.startswith("זמן ריצה הבא:"):
-                        time_part = line.split()[-1] 
-                        task_time_str = ":".join(time_part.split(":")[:2])
-                        break
-                
-                if task_time_str:
-                    datetime.strptime(task_time_str, "%H:%M") 
-                    log_info(f"Parsed existing restart task time: {task_time_str}")
-                    new_status = f"משימת הפעלה מחדש קיימת לשעה {task_time_str}"
-                    if status_is_lockout_related:
-                        self.status_label.config(text=f"{current_status_text}\n{new_status}", foreground="green")
-                    else:
-                        self.status_label.config(text=new_status, foreground="green")
-
-                    h, m = task_time_str.split(":")
-                    self.hour_var.set(h)
-                    self.minute_var.set(m)
-                else: 
-                    log_warning("Restart task found, but couldn't parse 'Next Run Time'.")
-                    new_status = "משימת הפעלה מחדש קיימת (לא ניתן לקרוא שעה)."
-                    if status_is_lockout_related:
-                         self.status_label.config(text=f"{current_status_text}\n{new_status}", foreground="green")
-                    else:
-                        self.status_label.config(text=new_status, foreground="green")
-
-            except Exception as e:
-                log_exception("Error parsing existing restart task time.")
-                new_status = "משימת הפעלה מחדש קיימת (שגיאה בקריאת שעה)."
-                if status_is_lockout_related:
-                     self.status_label.config(text=f"{current_status_text}\n{new_status}", foreground="orange")
-                else:
-                    self.status_label.config(text=new_status, foreground="orange")
-        else: 
-            log_info(f"Restart task '{TASK_NAME}' not found or error querying.")
-            if not status_is_lockout_related: 
-                 self.status_label.config(text="לא מוגדרת משימת הפעלה מחדש.", foreground="blue")
-
-    def delete_task(self, task_name):
-        # This function content remains the same
-        log_info(f"Attempting to delete task: {task_name}")
-        command = ["schtasks", "/delete", "/tn", task_name, "/f"]
-        success, message = self._run_command(command)
-        return success, message
+        if status_is_lockout_related:
+            self.status_label.config(text=f"{current_status_text}\n{new_status}", foreground=color)
+        else:
+            self.status_label.config(text=new_status, foreground=color)
 
 
 # --- נקודת הכניסה הראשית ---